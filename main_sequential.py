@@ -1,21 +1,30 @@
 """
-ProductHunt scraper entrypoint (sequential version - no concurrency).
+ProductHunt scraper entrypoint (sequential over dates; products of a date are
+scraped concurrently, up to CONCURRENCY_LIMIT at a time).
 
-Loads config, sets up logging/BigQuery/JSON output/checkpointing, runs the main
+run_main() loads config, sets up logging/BigQuery/JSON output (setup()), runs the main
 async loop (dates → products → BigQuery and optional JSON), and ensures
 graceful shutdown (browser.close on exit or interrupt).
 """
 import os
 import sys
 import asyncio
+import hashlib
 import json
 import logging
 import yaml
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
 from tqdm import tqdm
 from pyvirtualdisplay import Display
 from producthunt_scraper.core.bigquery import *
 from producthunt_scraper.core.json_output import JsonOutput
 from producthunt_scraper.core.script import *
+from producthunt_scraper.scraper.base_scraper import set_requests_per_second, set_static_fetch
+from producthunt_scraper.scraper.static_fetch import close_static_client
+from producthunt_scraper.scraper.tab_pool import TabPool, MAX_TABS
 from datetime import datetime, timedelta
 
 
@@ -29,6 +38,8 @@ TABLE_ID = ""
 PROXY_IP = None
 PROXY_URL = None
 CONCURRENCY_LIMIT = 0
+REQUESTS_PER_SECOND = 5
+STATIC_FETCH = False
 
 DISPLAY_EMULATION = False
 JSON_OUTPUT = False
@@ -36,32 +47,37 @@ JSON_OUTPUT = False
 START_YEAR = 0
 START_MONTH = 0
 START_DAY = 0
-try:
-    with open(yaml_file, "r") as f:
-        config = yaml.safe_load(f)
-    BIGQUERY_JSON = config["BIGQUERY_JSON"]
-    TABLE_ID = config["BIGQUERY_TABLE_ID"]
-    PROXY_IP = config.get("PROXY_IP")
-    PROXY_URL = config.get("PROXY_URL")
-    CONCURRENCY_LIMIT = config.get("CONCURRENCY_LIMIT")
-
-    DISPLAY_EMULATION = config.get("DISPLAY_EMULATION")
-    JSON_OUTPUT = config.get("JSON_OUTPUT", False)
-
-    START_YEAR = config.get("START_YEAR")
-    START_MONTH = config.get("START_MONTH")
-    START_DAY = config.get("START_DAY")
-except FileNotFoundError:
-    raise FileNotFoundError(f"YAML config file '{yaml_file}' not found.")
-except yaml.YAMLError as e:
-    raise ValueError(f"Error parsing YAML file '{yaml_file}': {e}")
+
+def load_config():
+    """Read yaml_file into the module-level config values."""
+    global BIGQUERY_JSON, TABLE_ID, PROXY_IP, PROXY_URL, CONCURRENCY_LIMIT, REQUESTS_PER_SECOND, STATIC_FETCH
+    global DISPLAY_EMULATION, JSON_OUTPUT, START_YEAR, START_MONTH, START_DAY
+    try:
+        with open(yaml_file, "r") as f:
+            config = yaml.load(f, Loader=SafeLoader)
+        BIGQUERY_JSON = config["BIGQUERY_JSON"]
+        TABLE_ID = config["BIGQUERY_TABLE_ID"]
+        PROXY_IP = config.get("PROXY_IP")
+        PROXY_URL = config.get("PROXY_URL")
+        CONCURRENCY_LIMIT = config.get("CONCURRENCY_LIMIT")
+        REQUESTS_PER_SECOND = config.get("REQUESTS_PER_SECOND") or REQUESTS_PER_SECOND
+        STATIC_FETCH = config.get("STATIC_FETCH", False)
+
+        DISPLAY_EMULATION = config.get("DISPLAY_EMULATION")
+        JSON_OUTPUT = config.get("JSON_OUTPUT", False)
+
+        START_YEAR = config.get("START_YEAR")
+        START_MONTH = config.get("START_MONTH")
+        START_DAY = config.get("START_DAY")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"YAML config file '{yaml_file}' not found.")
+    except yaml.YAMLError as e:
+        raise ValueError(f"Error parsing YAML file '{yaml_file}': {e}")
 
 
 # ----------------------------
 # Logging and Setup
 # ----------------------------
-start_str = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-
 # Custom handler that uses tqdm.write() to avoid interfering with progress bar
 class TqdmLoggingHandler(logging.Handler):
     def emit(self, record):
@@ -71,41 +87,51 @@ class TqdmLoggingHandler(logging.Handler):
         except Exception:
             self.handleError(record)
 
-# Set up logging
-os.makedirs("log", exist_ok=True)
-# Use TqdmLoggingHandler for stderr to avoid conflicts with tqdm
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(f'log/scraper_{start_str}.log'),
-        TqdmLoggingHandler()  # Use custom handler instead of StreamHandler
-    ]
-)
 logger = logging.getLogger(__name__)
 
-
-# ----------------------------
-# Virtual Display
-# ----------------------------
 display = None
-if DISPLAY_EMULATION:
-    display = Display(visible=False, size=(800, 600))
-    display.start()
-
-# ----------------------------
-# BigQuery Client
-# ----------------------------
-bq_client = bigquery.Client.from_service_account_json(BIGQUERY_JSON)
-bigq = BigQueryClient(table_id=TABLE_ID, logger=logger, bigquery_client=bq_client)
-
-# ----------------------------
-# JSON Output (optional)
-# ----------------------------
+bigq: BigQueryClient | None = None
 json_output: JsonOutput | None = None
-if JSON_OUTPUT:
-    json_output = JsonOutput(filepath="output/products.json", logger=logger)
-    logger.info("JSON output enabled: output/products.json")
+
+def setup():
+    """
+    Load config and create the run's logging, virtual display, rate limits, BigQuery client and JSON output.
+    Called from run_main(), not at import: parse worker processes started with spawn/forkserver
+    re-import this module and must not repeat any of it.
+    """
+    global display, bigq, json_output
+    load_config()
+
+    # Set up logging
+    start_str = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+    os.makedirs("log", exist_ok=True)
+    # Use TqdmLoggingHandler for stderr to avoid conflicts with tqdm
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(f'log/scraper_{start_str}.log'),
+            TqdmLoggingHandler()  # Use custom handler instead of StreamHandler
+        ]
+    )
+
+    # Virtual Display
+    if DISPLAY_EMULATION:
+        display = Display(visible=False, size=(800, 600))
+        display.start()
+
+    # Rate Limit
+    set_requests_per_second(REQUESTS_PER_SECOND)
+    set_static_fetch(STATIC_FETCH)
+
+    # BigQuery Client
+    bq_client = bigquery.Client.from_service_account_json(BIGQUERY_JSON)
+    bigq = BigQueryClient(table_id=TABLE_ID, logger=logger, bigquery_client=bq_client)
+
+    # JSON Output (optional)
+    if JSON_OUTPUT:
+        json_output = JsonOutput(filepath="output/products.ndjson", logger=logger)
+        logger.info("JSON output enabled: output/products.ndjson")
 
 
 # ----------------------------
@@ -113,12 +139,21 @@ if JSON_OUTPUT:
 # ----------------------------
 CHECKPOINT_FILE = "checkpoint.json"
 
+def config_hash() -> str:
+    """Hash of the start-date config; a checkpoint is only resumed if it was written under the same start date."""
+    start_config = {"START_YEAR": START_YEAR, "START_MONTH": START_MONTH, "START_DAY": START_DAY}
+    return hashlib.sha256(yaml.safe_dump(start_config).encode()).hexdigest()
+
 def load_checkpoint():
-    """Load the last processed date from checkpoint file. Returns None if missing or invalid."""
+    """Load the last processed date from checkpoint file. Returns None if missing, invalid, or written under another start date."""
     if os.path.exists(CHECKPOINT_FILE):
         try:
             with open(CHECKPOINT_FILE, 'r') as f:
                 checkpoint_data = json.load(f)
+                saved_hash = checkpoint_data.get('config_hash')
+                if saved_hash is not None and saved_hash != config_hash():
+                    logger.warning("Checkpoint was written with a different start date config. Not resuming; starting from beginning.")
+                    return None
                 checkpoint_date = datetime.fromisoformat(checkpoint_data.get('last_date', ''))
                 last_index = checkpoint_data.get('last_index', 0)  # Load it
                 logger.info(f"Loaded checkpoint: Last processed date = {checkpoint_date.date()}")
@@ -128,15 +163,21 @@ def load_checkpoint():
     return None
 
 def save_checkpoint(date: datetime, last_index: int):
-    """Save the last processed date to checkpoint file (CHECKPOINT_FILE)."""
+    """Save the last processed date to checkpoint file (CHECKPOINT_FILE) atomically via a temp file and rename."""
     try:
         checkpoint_data = {
             'last_date': date.isoformat(),
             'last_index': last_index,  # Save the index
             'last_updated': datetime.now().isoformat(),
+            'config_hash': config_hash(),
         }
-        with open(CHECKPOINT_FILE, 'w') as f:
+        tmp_file = CHECKPOINT_FILE + ".tmp"
+        with open(tmp_file, 'w') as f:
             json.dump(checkpoint_data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        # Atomic on POSIX and Windows: a crash leaves either the old or the new checkpoint, never a partial one
+        os.replace(tmp_file, CHECKPOINT_FILE)
         logger.debug(f"Checkpoint saved: {date.date()}")
     except Exception as e:
         logger.error(f"Error saving checkpoint: {e}")
@@ -145,56 +186,81 @@ def save_checkpoint(date: datetime, last_index: int):
 # ----------------------------
 # Main Processing Function
 # ----------------------------
-async def process_one_product(browser, product, date_str: str, global_index: int) -> int:
+async def process_one_product(pool: TabPool, product, date_str: str) -> Product | None:
     """
-    Scrape a single product, set date, send to BigQuery (and optional JSON). Returns 1 on success.
+    Scrape a single product, set date, and optionally append it to JSON. Returns the full Product, or None on failure.
 
-    Processes products sequentially (no concurrency). Calls scrape_single_product, then bigq.insert_product(index, product)
-    and optionally json_output.add_product. global_index is the row index (0 = first product at start date).
+    Calls scrape_single_product, then optionally json_output.add_product. Rows are queued for BigQuery per date in process_date.
     """
     try:
-        full = await scrape_single_product(browser, product)
+        full = await scrape_single_product(pool, product)
         full.date = date_str
-        bigq.insert_product(date_str, global_index, full)
         if json_output is not None:
             await json_output.add_product(full)
-        return 1
+        return full
     except Exception as e:
         logger.error(f"Error processing product {product.name!r}: {e}")
-        return 0
+        return None
 
 
-async def process_date(browser, date_index: int, date: datetime, base_index: int) -> tuple[int, datetime, int]:
+async def process_date(pool: TabPool, date_index: int, date: datetime, base_index: int) -> tuple[int, datetime, int]:
     """
-    Scrape all products for a date; for each product scrape details and send to BigQuery.
+    Scrape all products for a date; for each product scrape details, then queue the date's rows for BigQuery.
+    The rows are loaded by flush_bigquery(), once enough dates are buffered.
 
     Returns (date_index, date, processed_count). base_index is the global row index for the first product of this date.
-    Processes products sequentially (no concurrency).
+    Up to CONCURRENCY_LIMIT products are scraped at once; results keep leaderboard order.
     """
     date_str = date.strftime("%Y-%m-%d")
     logger.info(f"Processing date {date_str} (date_index={date_index})")
-    products = await scrape_products(browser, date)
+    products = await scrape_products(pool, date)
     if not products:
         logger.info(f"No products for date {date_str}")
         return (date_index, date, 0)
     
-    processed = 0
-    for i, product in enumerate(products):
-        result = await process_one_product(browser, product, date_str, base_index + i)
-        processed += result
+    # Acquire a slot before creating each task, so at most CONCURRENCY_LIMIT tasks exist at a time
+    semaphore = asyncio.Semaphore(CONCURRENCY_LIMIT or 1)
+    tasks = []
+    for product in products:
+        await semaphore.acquire()
+        task = asyncio.create_task(process_one_product(pool, product, date_str))
+        task.add_done_callback(lambda _: semaphore.release())
+        tasks.append(task)
+    results = await asyncio.gather(*tasks)
+
+    scraped = [full for full in results if full is not None]
+    processed = len(scraped)
+
+    # Rows get consecutive indices starting at base_index; loaded with other dates in one job
+    bigq.add_products(date_str, base_index, scraped)
     
     if processed < len(products):
         failed = len(products) - processed
-        logger.warning(f"Date {date_str}: {processed} sent to BQ, {failed} failed")
+        logger.warning(f"Date {date_str}: {processed} queued for BQ, {failed} failed")
     else:
-        logger.info(f"Date {date_str}: {processed} products sent to BigQuery")
+        logger.info(f"Date {date_str}: {processed} products queued for BigQuery")
     return (date_index, date, processed)
 
 
+def flush_bigquery(last_date: datetime | None, last_index: int) -> None:
+    """
+    Load all buffered rows in one BigQuery job, then checkpoint last_date (the newest date in the buffer).
+    The checkpoint only moves past dates whose rows are loaded, so a crash or failed load re-scrapes them.
+    Raises RuntimeError if the load job fails, leaving the checkpoint where it was.
+    """
+    rows = bigq.pending_rows
+    if not bigq.flush():
+        raise RuntimeError(f"BigQuery load of {rows} rows failed; stopping without checkpointing their dates")
+    if last_date is not None:
+        save_checkpoint(last_date, last_index)
+        # Use tqdm.write() for logging to avoid interfering with progress bar
+        tqdm.write(f"Checkpoint saved: {last_date.date()} ({rows} rows loaded)")
+
+
 async def main():
     """
-    Main async entry: start browser, load checkpoint, loop over dates from start_dt to today,
-    process each date (scrape products → BigQuery/JSON), save checkpoint, rolling today.
+    Main async entry: start browser and tab pool, load checkpoint, loop over dates from start_dt to today,
+    process each date (scrape products → BigQuery/JSON), load buffered rows and save checkpoint, rolling today.
     Browser cleanup is handled automatically by nodriver.
     """
     try:
@@ -203,10 +269,18 @@ async def main():
             logger.error("Failed to start browser. Exiting.")
             return
         logger.info("Browser started successfully")
+        pool = await TabPool.create(browser, MAX_TABS)
+        logger.info(f"Tab pool ready ({MAX_TABS} tabs)")
     except Exception as e:
         logger.error(f"Failed to start browser: {e}. Exiting.")
         return
 
+    # Parse workers start here rather than at import, so they never re-run module setup
+    start_parse_pool()
+
+    # Newest date whose rows are buffered or loaded, and the row index after it
+    last_date, last_index = None, 0
+
     try:
         base_start = datetime(START_YEAR, START_MONTH, START_DAY)
 
@@ -227,36 +301,36 @@ async def main():
             logger.info("Start date is after today; nothing to process.")
             return
 
-        current_date = start_dt
         total_processed = 0
 
-        # Calculate initial total number of dates to process
-        initial_total = (today - start_dt).days + 1
+        # Precompute (date_index, date) for every date to process; date_index is days since base_start
+        total_days = (today - base_start).days + 1
+        ckpt_offset = (start_dt - base_start).days
+        dates_to_process = [(i, base_start + timedelta(days=i)) for i in range(ckpt_offset, total_days)]
         
         # Configure tqdm to write to stderr and ensure it's visible
         with tqdm(
             desc="Processing dates", 
             unit="date", 
-            total=initial_total, 
+            total=len(dates_to_process), 
             initial=0,
             file=sys.stderr,  # Write to stderr to avoid conflicts with logging
             disable=False,    # Ensure it's enabled
             dynamic_ncols=True,  # Adapt to terminal width
             ascii=False       # Use Unicode for better display
         ) as pbar:
-            while current_date <= today:
+            # Iterating a list picks up items appended during the loop (see rolling today below)
+            for idx, current_date in dates_to_process:
 
-                idx = (current_date - base_start).days
-                _, _, count = await process_date(browser, idx, current_date, base_index)
+                _, _, count = await process_date(pool, idx, current_date, base_index)
                 base_index += count
                 total_processed += count
+                last_date, last_index = current_date, base_index
 
-                # Save checkpoint after each date processed
-                save_checkpoint(current_date, base_index)
-                # Use tqdm.write() for logging to avoid interfering with progress bar
-                tqdm.write(f"Checkpoint saved: {current_date.date()} ({count} products this date)")
+                # Load (and checkpoint) once enough rows are buffered; with nothing buffered, checkpoint right away
+                if bigq.should_flush() or bigq.pending_rows == 0:
+                    flush_bigquery(last_date, last_index)
 
-                current_date += timedelta(days=1)
                 pbar.update(1)
 
                 # Rolling today: if calendar advanced, extend range
@@ -265,19 +339,36 @@ async def main():
                     extra_days = (new_today - today).days
                     if extra_days > 0:
                         tqdm.write(f"Rolling today: {today.date()} -> {new_today.date()} (+{extra_days} day(s))")
+                        new_total_days = (new_today - base_start).days + 1
+                        dates_to_process.extend(
+                            (i, base_start + timedelta(days=i)) for i in range(total_days, new_total_days)
+                        )
+                        total_days = new_total_days
                         # Update progress bar total to reflect new end date
-                        new_total = (new_today - start_dt).days + 1
-                        pbar.total = new_total
+                        pbar.total = len(dates_to_process)
                         pbar.refresh()  # Ensure progress bar updates immediately
                     today = new_today
 
+        flush_bigquery(last_date, last_index)
         logger.info(f"Done. Total products sent to BigQuery: {total_processed}")
     finally:
+        # Stopped early (error or interrupt): still load the dates fully scraped so far
+        if bigq.pending_rows:
+            try:
+                flush_bigquery(last_date, last_index)
+            except RuntimeError as e:
+                logger.error(str(e))
+        await pool.close()
+        await close_static_client()
+        shutdown_parse_pool()
+        if json_output is not None:
+            json_output.close()
         logger.info("Processing complete. Browser will be cleaned up automatically.")
 
 
 def run_main():
-    """Run asyncio main(); handles KeyboardInterrupt and logs fatal errors. Re-raises after logging."""
+    """Run setup() and asyncio main(); handles KeyboardInterrupt and logs fatal errors. Re-raises after logging."""
+    setup()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
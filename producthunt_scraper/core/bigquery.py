@@ -1,44 +1,85 @@
 """
 BigQuery client for inserting scraped Product rows as JSON.
 
-Uses google.cloud.bigquery; one row per product via insert_rows_json.
-Each row has two columns: index (INT64) and product (JSON).
+Uses google.cloud.bigquery. add_products() buffers the products of a date as NDJSON rows;
+flush() appends everything buffered with a single load job. Rows are buffered across dates,
+so days with few products (early leaderboards) do not each cost a load job.
+Each row has three columns: date (DATE), index (INT64) and product (JSON).
 """
+import io
 import json
 import logging
-from xmlrpc.client import DateTime
-from datetime import datetime
+from typing import List
 
 from google.cloud import bigquery
 from producthunt_scraper.core.model import Product
 
+# Rows per load job. Load jobs are limited to 1500 per table per day, so one job per date
+# could run out on a backfill of small early dates; batching by rows keeps the job count low.
+LOAD_BATCH_ROWS = 2000
+
 
 class BigQueryClient:
-    """Client to insert Product rows into a BigQuery table as JSON."""
+    """Client to insert Product rows into a BigQuery table as JSON. Rows are buffered; call flush() to load them."""
 
-    def __init__(self, table_id: str, logger: logging.Logger, bigquery_client: bigquery.Client):
-        """Initialize with table_id, logger, and google.cloud.bigquery.Client."""
+    def __init__(self, table_id: str, logger: logging.Logger, bigquery_client: bigquery.Client,
+                 batch_rows: int = LOAD_BATCH_ROWS):
+        """Initialize with table_id, logger, google.cloud.bigquery.Client and optional batch_rows."""
         self.table_id = table_id
         self.logger = logger
         self.bq_client = bigquery_client
+        self.batch_rows = batch_rows
+        self._buffer = io.BytesIO()
+        self._pending = 0
+
+    @property
+    def pending_rows(self) -> int:
+        """Number of rows buffered and not yet loaded."""
+        return self._pending
 
-    def insert_product(self, date: str, index: int, product: Product, ) -> None:
+    def should_flush(self) -> bool:
+        """True once at least batch_rows rows are buffered."""
+        return self._pending >= self.batch_rows
+
+    def add_products(self, date: str, start_index: int, products: List[Product]) -> None:
         """
-        Insert one row: index (INT64) and product (JSON). Product must have date set (YYYY-MM-DD).
-        
-        Table must have exactly two columns:
+        Buffer all products of one date as newline-delimited JSON rows; index runs from start_index upwards.
+
+        Table must have exactly three columns:
+        - date: DATE
         - index: INT64
         - product: JSON
-        
+
         Use the DDL in bigquery_create_table.txt to create the table.
         """
+        date_json = json.dumps(date)
+        for offset, product in enumerate(products):
+            # Splice pydantic-core's JSON in directly instead of building and re-encoding a dict
+            line = f'{{"date": {date_json}, "index": {start_index + offset}, "product": {product.model_dump_json()}}}\n'
+            self._buffer.write(line.encode("utf-8"))
+        self._pending += len(products)
+
+    def flush(self) -> bool:
+        """
+        Append all buffered rows with a single load job and clear the buffer.
+        Returns True if the rows were loaded (or nothing was buffered), False if the job failed;
+        on failure the rows stay buffered.
+        """
+        if not self._pending:
+            return True
+        rows = self._pending
         try:
-            product_json = json.dumps(product.model_dump(mode="json"))
-            row = {"date": date, "index": index, "product": product_json}
-            errors = self.bq_client.insert_rows_json(self.table_id, [row])
-            if errors:
-                self.logger.error(f"[BQ] Insert failed for product {product.name!r}: {errors}")
-            else:
-                self.logger.debug(f"[BQ] Inserted product {product.name!r} date={product.date}")
+            job_config = bigquery.LoadJobConfig(
+                source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+                write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
+            )
+            job = self.bq_client.load_table_from_file(self._buffer, self.table_id, job_config=job_config, rewind=True)
+            job.result()
+            self.logger.debug("[BQ] Loaded %d rows", rows)
         except Exception as e:
-            self.logger.error(f"[BQ EXCEPTION] product={getattr(product, 'name', '?')} {e}", exc_info=True)
\ No newline at end of file
+            self.logger.error(f"[BQ EXCEPTION] load job for {rows} rows failed: {e}", exc_info=True)
+            self._buffer.seek(0, io.SEEK_END)
+            return False
+        self._buffer = io.BytesIO()
+        self._pending = 0
+        return True
@@ -3,8 +3,8 @@ Memory-efficient JSON output for scraped products.
 
 Uses JSONL (JSON Lines) format: one JSON object per line, append-only.
 This avoids loading the entire file into memory and allows efficient appending.
+finalize() converts the file to a single JSON array for consumers that need one.
 """
-import json
 import logging
 import asyncio
 from pathlib import Path
@@ -15,6 +15,7 @@ class JsonOutput:
     """
     Manages a JSONL file for scraped products. Appends one product per line.
     Memory-efficient: does not load existing products into memory.
+    The file is opened once and kept open until close().
     """
 
     def __init__(self, filepath: str, logger: logging.Logger):
@@ -24,9 +25,9 @@ class JsonOutput:
         """
         self.filepath = Path(filepath)
         self.logger = logger
-        self._lock = asyncio.Lock()
-        self._file_handle = None
+        self._lock = asyncio.Lock()  # protects _file_handle
         self._ensure_file_exists()
+        self._file_handle = open(self.filepath, "a", encoding="utf-8")
 
     def _ensure_file_exists(self) -> None:
         """Ensure the output directory exists and file is ready for appending."""
@@ -49,10 +50,34 @@ class JsonOutput:
         Append one product as a JSON line (JSONL format).
         Memory-efficient: appends directly to file without loading existing data.
         """
+        product_json = product.model_dump_json()
         async with self._lock:
-            product_dict = product.model_dump(mode="json")
-            # Append mode: write one JSON object per line
-            with open(self.filepath, "a", encoding="utf-8") as f:
-                json.dump(product_dict, f, ensure_ascii=False)
-                f.write("\n")  # JSONL: one JSON object per line
-        self.logger.debug(f"[JSON] Appended product {product.name!r} to {self.filepath}")
+            # One JSON object per line; flush so a crash loses at most the current line
+            self._file_handle.write(product_json + "\n")
+            self._file_handle.flush()
+        self.logger.debug("[JSON] Appended product %r to %s", product.name, self.filepath)
+
+    def close(self) -> None:
+        """Close the output file handle. Safe to call more than once."""
+        if self._file_handle is not None and not self._file_handle.closed:
+            self._file_handle.close()
+
+    def finalize(self, array_path: str) -> None:
+        """
+        Write all products to array_path as a single JSON array, streaming line by line.
+        Closes the JSONL handle first; the JSONL file itself is left untouched.
+        """
+        self.close()
+        with open(self.filepath, "r", encoding="utf-8") as src, open(array_path, "w", encoding="utf-8") as dst:
+            dst.write("[")
+            first = True
+            for line in src:
+                line = line.strip()
+                if not line:
+                    continue
+                if not first:
+                    dst.write(",")
+                dst.write(line)
+                first = False
+            dst.write("]")
+        self.logger.info(f"[JSON] Wrote JSON array to {array_path}")
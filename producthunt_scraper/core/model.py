@@ -40,22 +40,12 @@ class BuiltWithProduct(BaseModel):
     categories: List[str]
     ph_link: str
 
-class BuiltWithProduct(BaseModel):
-    name: str
-    tagline: str
-    categories: List[str]
-    ph_link: str
-
 class BuiltWithGroup(BaseModel):
     """Built With section group: group_name and list of BuiltWithProduct."""
 
     group_name: str
     products: List[BuiltWithProduct]
 
-class BuiltWithGroup(BaseModel):
-    group_name: str
-    products: List[BuiltWithProduct]
-
 
 class ProductPage(BaseModel):
     """Full product page: name, description, categories, website, team_members, built_with."""
@@ -1,89 +1,211 @@
 """
 Scraping orchestration: daily leaderboard list and full product detail.
 
-scrape_products(browser, date) → list of Product (leaderboard only).
-scrape_single_product(browser, product) → Product with product_page filled (overview, makers, built-with).
+scrape_products(pool, date) → list of Product (leaderboard only).
+scrape_single_product(pool, product) → Product with product_page filled (overview, makers, built-with).
+
+Pages are fetched on the event loop; their HTML is parsed in a process pool so CPU-bound
+soup building and traversal does not hold up the browser I/O of other products.
 """
+import asyncio
+import functools
+import logging
+import os
 import nodriver as nd
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from typing import List
 from urllib.parse import urljoin
 from datetime import datetime
-from producthunt_scraper.core.model import Product
-from producthunt_scraper.scraper.base_scraper import get_list_of_product_soups, get_single_product_soup
-from producthunt_scraper.scraper.parser import parse_page, parse_teams, parse_team_page, parse_built_with_page, parse_products
-
-
-async def scrape_products(browser: nd.Browser, date: datetime) -> List[Product]:
-    """Fetch daily leaderboard page for date; parse and return list of Product (product_page None)."""
-    main_url = "https://www.producthunt.com/leaderboard/daily/"
+from producthunt_scraper.core.model import Product, TeamMember, TeamPage
+from producthunt_scraper.scraper.base_scraper import get_list_of_products_html, get_single_product_html, fetch_many, canonical_url, PageNotFound
+from producthunt_scraper.scraper.tab_pool import TabPool
+from producthunt_scraper.scraper.parser import parse_page_html, parse_teams_html, parse_team_page_html, parse_built_with_html, parse_products_html
+
+MAIN_URL = "https://www.producthunt.com/"
+PRODUCTS_URL = "https://www.producthunt.com/products/"
+LEADERBOARD_URL = "https://www.producthunt.com/leaderboard/daily/"
+MAKERS_HREF = "makers"
+BUILT_WITH_HREF = "built-with"
+
+# With static fetch enabled, raw HTML containing the page's marker is taken as server-rendered and parsed
+# without a browser tab. Each marker is something the page's parser needs, not just the wait selector.
+PRODUCT_MARKER = "<h1"
+MAKERS_MARKER = "maker-card"
+MAKER_MARKER = 'data-test="user-link"'
+BUILT_WITH_MARKER = "<details"
+
+logger = logging.getLogger(__name__)
+
+# Parse worker processes; created by start_parse_pool() (or the first parse), never at import time,
+# since spawn/forkserver workers re-import the main module
+_parse_pool: ProcessPoolExecutor | None = None
+
+# Makers often appear on several products: parsed maker pages keyed by canonical URL, most recent last.
+# Entries are futures, so concurrent products asking for the same maker share one fetch.
+MAKER_CACHE_SIZE = 4096
+_maker_pages: "OrderedDict[str, asyncio.Future]" = OrderedDict()
+
+
+def start_parse_pool() -> ProcessPoolExecutor:
+    """Start the parse worker processes if they are not running yet, and return the pool."""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+    return _parse_pool
+
+
+def _restart_parse_pool(broken: ProcessPoolExecutor) -> None:
+    """Replace a broken parse pool with a fresh one, unless a concurrent caller already did."""
+    global _parse_pool
+    if _parse_pool is broken:
+        broken.shutdown(wait=False, cancel_futures=True)
+        _parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+
+
+async def _parse(parse_fn, html: str):
+    """
+    Run a parser.parse_*_html function on html in the parse process pool.
+    If a worker died, the pool is broken and would fail every later parse: it is restarted and the parse
+    retried once. If the retry breaks the new pool too, it is restarted again and BrokenProcessPool raised.
+    """
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        pool = start_parse_pool()
+        try:
+            return await loop.run_in_executor(pool, parse_fn, html)
+        except BrokenProcessPool:
+            logger.warning("Parse worker pool broken (%s); restarting it", parse_fn.__name__)
+            _restart_parse_pool(pool)
+            if attempt:
+                raise
+
+
+async def _fetch_and_parse(pool: TabPool, link: str, selector: str, parse_fn, marker: str | None = None):
+    """Fetch one page and parse it as soon as it arrives. A 404 page is parsed as empty HTML."""
+    try:
+        html = await get_single_product_html(pool, link, selector, marker=marker)
+    except PageNotFound:
+        logger.warning("Page not found: %s. Using empty HTML.", link)
+        html = ""
+    return await _parse(parse_fn, html)
+
+
+def shutdown_parse_pool() -> None:
+    """Stop the parse worker processes. Call once at the end of a run."""
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=True, cancel_futures=True)
+        _parse_pool = None
+
+
+async def scrape_products(pool: TabPool, date: datetime) -> List[Product]:
+    """Fetch daily leaderboard page for date using a tab from pool; parse and return list of Product (product_page None)."""
     date_href = date.strftime("%Y/%m/%d")
-    page_url = urljoin(main_url, date_href)
+    page_url = LEADERBOARD_URL + date_href
 
-    print(f"Scraping {page_url} | Date: {date.strftime('%Y-%m-%d')}")
+    date_str = date.strftime("%Y-%m-%d")
+    logger.debug("Scraping %s | Date: %s", page_url, date_str)
 
-    soup = await get_list_of_product_soups(browser, page_url)
-    products = await parse_products(soup)
+    try:
+        html = await get_list_of_products_html(pool, page_url)
+    except PageNotFound:
+        logger.warning("Leaderboard not found: %s", page_url)
+        return []
+    products = await _parse(parse_products_html, html)
 
-    date_str = date.strftime("%Y-%m-%d")
     for product in products:
         product.date = date_str
 
-    print(products)
+    # repr of the whole product list is expensive; only build it when debugging
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("products=%s", products)
     return products
 
 
-async def scrape_single_product(browser: nd.Browser, product: Product) -> Product:
-    """Fetch product overview, makers, and built-with pages; attach product_page to product and return it."""
-    product_href = product.ph_url
-
-    main_url = "https://www.producthunt.com/"
-    base_url = "https://www.producthunt.com/products/"
-    built_with_href = "built-with"
-    makers_href = "makers"
-
-    product_url = urljoin(base_url, product_href) + "/"
-
-    # Product Page (Overview)
-    pp_selector = 'main h2'
-    pp_soup = await get_single_product_soup(browser, product_url, pp_selector)
-
-    product_page = await parse_page(pp_soup)
-
-    # Team Page
-    tp_url = urljoin(product_url, makers_href)
+async def _get_team_pages(pool: TabPool, ml_urls: List[str]) -> List[TeamPage]:
+    """
+    Return the parsed TeamPage for each maker URL (canonical), fetching each unique URL at most once.
+    URLs already cached, or in flight for another product, are awaited instead of fetched again.
+    """
+    loop = asyncio.get_running_loop()
+    futures = {}
+    missing = []
+    for url in dict.fromkeys(ml_urls):
+        future = _maker_pages.get(url)
+        if future is None:
+            future = loop.create_future()
+            _maker_pages[url] = future
+            missing.append(url)
+        else:
+            _maker_pages.move_to_end(url)
+        futures[url] = future
+    while len(_maker_pages) > MAKER_CACHE_SIZE:
+        _maker_pages.popitem(last=False)
+
+    if missing:
+        ml_selector = 'main h2'
+        try:
+            pages = await fetch_many(pool, missing, ml_selector, process=functools.partial(_parse, parse_team_page_html),
+                                     marker=MAKER_MARKER)
+        except BaseException as e:
+            # Fetch errors already became empty pages; this is cancellation or a failing parse (e.g. BrokenProcessPool).
+            # Other products may be waiting on these futures: only cancel them if we were cancelled ourselves.
+            for url in missing:
+                _maker_pages.pop(url, None)
+                if isinstance(e, asyncio.CancelledError):
+                    futures[url].cancel()
+                else:
+                    futures[url].set_exception(e)
+            raise
+        for url, page in zip(missing, pages):
+            futures[url].set_result(page)
+            # An empty page usually means the fetch failed: do not keep it, so a later product retries
+            if not page.about and not page.links:
+                _maker_pages.pop(url, None)
+
+    # shield: cancelling this product must not cancel a future other products are waiting on
+    return [await asyncio.shield(futures[url]) for url in ml_urls]
+
+
+async def _scrape_team(pool: TabPool, tp_url: str) -> List[TeamMember]:
+    """Fetch and parse the makers page, then every maker's page, attaching each TeamPage to its TeamMember."""
     tp_selector = 'main h2'
-    tp_soup = await get_single_product_soup(browser, tp_url, tp_selector)
+    teams = await _fetch_and_parse(pool, tp_url, tp_selector, parse_teams_html, MAKERS_MARKER)
+
+    # Team Members' Pages: fetch all makers concurrently, parsing each one as it arrives
+    ml_urls = [canonical_url(urljoin(MAIN_URL, maker.href)) for maker in teams]
+    maker_pages_parsed = await _get_team_pages(pool, ml_urls)
 
-    print(f"Opening {tp_url}...")
+    # Update each Maker with their respective TeamPage
+    for team, team_page in zip(teams, maker_pages_parsed):
+        team.team_page = team_page
 
-    teams = await parse_teams(tp_soup)
+    return teams
 
-    # Loop over Team Members' Page + Update TeamPage
-    maker_links = [maker.href for maker in teams]
-    maker_pages_parsed = []
-    for maker_link in maker_links:
-        ml_url = urljoin(main_url, maker_link)
-        ml_selector = 'main h2'
-        ml_soup = await get_single_product_soup(browser, ml_url, ml_selector)
 
-        print(f"Opening {ml_url}...")
+async def scrape_single_product(pool: TabPool, product: Product) -> Product:
+    """Fetch product overview, makers, and built-with pages using tabs from pool; attach product_page to product and return it."""
+    product_href = product.ph_url
 
-        parsed_page = await parse_team_page(ml_soup)
-        maker_pages_parsed.append(parsed_page)
+    # product_url always ends with "/", so sub-pages are plain concatenation; no URL re-parsing needed
+    product_url = urljoin(PRODUCTS_URL, product_href) + "/"
+    tp_url = product_url + MAKERS_HREF
+    bw_url = product_url + BUILT_WITH_HREF
 
-    # Built With
-    bw_url = urljoin(product_url, built_with_href)
+    # Product Page (Overview), Team Page and Built With are independent: run them concurrently.
+    # Each page is parsed as soon as it is fetched, overlapping with the other fetches.
+    pp_selector = 'main h2'
     bw_selector = 'main h2'
-    bw_soup = await get_single_product_soup(browser, bw_url, bw_selector)
-
-    print(f"Opening {bw_url}...")
 
-    # parse
-    built_with = await parse_built_with_page(bw_soup)
+    logger.debug("Opening %s, %s, %s...", product_url, tp_url, bw_url)
 
-    # Update each Maker with their respective TeamPage
-    for team, team_page in zip(teams, maker_pages_parsed):
-        team.team_page = team_page
+    product_page, teams, built_with = await asyncio.gather(
+        _fetch_and_parse(pool, product_url, pp_selector, parse_page_html, PRODUCT_MARKER),
+        _scrape_team(pool, tp_url),
+        _fetch_and_parse(pool, bw_url, bw_selector, parse_built_with_html, BUILT_WITH_MARKER),
+    )
 
     # Update ProductPage
     product_page.team_members = teams
@@ -93,4 +215,4 @@ async def scrape_single_product(browser: nd.Browser, product: Product) -> Produc
     # Combine into a Product Object
     product.product_page = product_page
 
-    return product
\ No newline at end of file
+    return product
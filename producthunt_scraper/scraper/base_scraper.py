@@ -1,100 +1,288 @@
+import asyncio
+import json
+import logging
+import time
 import nodriver as nd
 import random
-from bs4 import BeautifulSoup
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from nodriver.core.connection import ProtocolException
+from tenacity import retry, stop_after_attempt, wait_random_exponential, retry_if_exception_type
+from websockets.exceptions import ConnectionClosed
+from producthunt_scraper.scraper.tab_pool import TabPool, MAX_TABS
+from producthunt_scraper.scraper.static_fetch import fetch_static_html
 
 MIN_HTML_LENGTH = 200
 MAX_ATTEMPTS = 5
 
 RET_MULTIPLIER = 1
-RET_MIN = 1
 RET_MAX = 5
 
+REQUESTS_PER_SECOND = 5
+
+# Seconds to wait for a page's ready selector: a page that has not rendered by then is retried
+LIST_WAIT_TIMEOUT = 8
+PAGE_WAIT_TIMEOUT = 4
+
+# Text of Product Hunt's 404 page, looked for in the rendered text when the ready selector times out
+NOT_FOUND_TEXT = "Page not found"
+_NOT_FOUND_JS = f"document.body !== null && document.body.innerText.includes({json.dumps(NOT_FOUND_TEXT)})"
+
+logger = logging.getLogger(__name__)
+
+# Max concurrent fetches per fetch_many() call; more than the tab pool size would only queue on the pool.
+MAX_SCRAPER_WORKERS = MAX_TABS
+
 class BadHTML(Exception):
     pass
 
-def return_empty_soup(retry_state):
+class PageNotFound(Exception):
+    """The link led to Product Hunt's 404 page. Not retried: another attempt would load the same page."""
+    pass
+
+# Errors worth retrying: bad/partial page, wait_for timeout, CDP errors, dropped connections.
+# Anything else (e.g. AttributeError, KeyError) is a bug and propagates on the first attempt.
+TRANSIENT = (BadHTML, asyncio.TimeoutError, ProtocolException, ConnectionClosed, ConnectionError)
+
+# Errors that mean the tab itself is broken and must be replaced rather than reused
+BROKEN_TAB = (ProtocolException, ConnectionClosed)
+
+
+class RateLimiter:
+    """
+    Token bucket shared by all page fetches: on average at most `rate` page loads per second,
+    with bursts of up to `rate` loads. Keeps the combined request rate of concurrent fetches
+    under Product Hunt's per-IP limit instead of letting it grow with concurrency. This is the
+    politeness budget; fetches do not add a per-request random sleep unless given wait_range.
+    """
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._tokens = max(rate, 1.0)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def set_rate(self, rate: float) -> None:
+        """Change the allowed page loads per second (and burst size)."""
+        self.rate = rate
+        self._tokens = min(self._tokens, max(rate, 1.0))
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it. Waiters are served in order."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                capacity = max(self.rate, 1.0)
+                self._tokens = min(capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+_rate_limiter = RateLimiter(REQUESTS_PER_SECOND)
+
+# Try a plain HTTP GET (static_fetch) before loading a page in a tab; off unless set_static_fetch(True)
+_static_fetch = False
+
+
+def set_requests_per_second(rate: float) -> None:
+    """Set the shared page-load rate limit used by get_list_of_products_html and get_single_product_html."""
+    _rate_limiter.set_rate(rate)
+
+def set_static_fetch(enabled: bool) -> None:
+    """Enable or disable the static HTTP fetch path tried before the browser."""
+    global _static_fetch
+    _static_fetch = bool(enabled)
+
+async def try_static_html(link: str, marker: str | None) -> str | None:
+    """
+    Fetch link over plain HTTP if the static path is enabled and the caller gave a marker.
+    Does not take a rate-limit token: the caller takes one per attempt, shared with the browser fallback.
+    Returns None when the browser is needed.
+    """
+    if not _static_fetch or marker is None:
+        return None
+    html = await fetch_static_html(link, marker)
+    if html is None or len(html.strip()) < MIN_HTML_LENGTH:
+        return None
+    return html
+
+def canonical_url(link: str) -> str:
+    """
+    Normalize a URL for deduplication: lowercase scheme and host, drop default ports,
+    trailing slash and fragment, and sort query parameters.
+    """
+    parts = urlsplit(link)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and not (scheme == "http" and parts.port == 80) and not (scheme == "https" and parts.port == 443):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+def log_retry(retry_state):
+    """
+    Log a failed attempt before tenacity sleeps and retries. The link is the second argument of both fetch helpers.
+    """
+    link = retry_state.args[1] if len(retry_state.args) > 1 else retry_state.kwargs.get("link")
+    logger.warning("Retry attempt %d for %s: %r", retry_state.attempt_number, link, retry_state.outcome.exception())
+
+async def wait_for_page(page: nd.Tab, selector: str, timeout: float) -> None:
+    """
+    Wait until selector appears on page. If it does not, check whether the 404 page loaded instead.
+    The check runs only after a timeout and reads the rendered text (which excludes script/JSON),
+    so normal page loads pay nothing extra and a bundle mentioning NOT_FOUND_TEXT is not mistaken for a 404.
+    Raises PageNotFound for a 404 page, or the selector wait's asyncio.TimeoutError otherwise.
+    """
+    try:
+        await page.wait_for(selector=selector, timeout=timeout)
+    except asyncio.TimeoutError:
+        if await page.evaluate(_NOT_FOUND_JS):
+            raise PageNotFound(page.url) from None
+        raise
+
+def return_empty_html(retry_state):
     """
-    Function to return an empty soup if the request fails. Used for retrying.
+    Function to return empty HTML if the request fails. Used for retrying.
     """
-    print(f"Failed after {retry_state.attempt_number} attempts. Returning empty soup.")
-    return BeautifulSoup("", "html.parser")
+    logger.error("Failed after %d attempts (%r). Returning empty HTML.", retry_state.attempt_number, retry_state.outcome.exception())
+    return ""
 
 @retry(
     stop=stop_after_attempt(MAX_ATTEMPTS),
-    wait=wait_exponential(multiplier=RET_MULTIPLIER, min=RET_MIN, max=RET_MAX),
-    retry=retry_if_exception_type(Exception), # retry on any exception.
-    retry_error_callback=return_empty_soup,
+    wait=wait_random_exponential(multiplier=RET_MULTIPLIER, max=RET_MAX),  # full jitter from 0, so even the first retry is spread out
+    retry=retry_if_exception_type(TRANSIENT),
+    before_sleep=log_retry,
+    retry_error_callback=return_empty_html,
 )
-async def get_list_of_product_soups(browser: nd.Browser, link) -> BeautifulSoup:
+async def get_list_of_products_html(pool: TabPool, link, wait_range: tuple[float, float] | None = None) -> str:
     """
-    This function is used to get the BS4 object of daily leaderboard page for a given date.
-    :param browser: no driver browser object.
+    This function is used to get the HTML of daily leaderboard page for a given date.
+    Parsing is left to the caller (see parser.parse_products_html), so it can run off the event loop.
+    :param pool: tab pool; a tab is leased per attempt, so retry backoff does not occupy a tab.
     :param link: the link of the daily leaderboard page for a given date.
-    :return: BS4 object.
+    :param wait_range: optional (min, max) seconds of random extra wait after load; None skips it.
+    :return: page HTML.
+    :raises PageNotFound: the link is a 404 page (raised on the first attempt, without retrying).
     """
-    page = None
+    # One token per attempt, whether the static GET or the browser ends up serving it
+    await _rate_limiter.acquire()
+    html = await try_static_html(link, 'post-item-')
+    if html is not None:
+        return html
+
+    page = await pool.acquire()
     try:
-        page = await browser.get(link, new_tab=True)
+        await page.get(link)
 
         # wait until loaded
-        await page.wait_for('[data-test="leaderboard-title"]')
-        await page.wait(random.uniform(0.2, 0.7))
+        await wait_for_page(page, '[data-test="leaderboard-title"]', LIST_WAIT_TIMEOUT)
+        if wait_range is not None:
+            await page.wait(random.uniform(*wait_range))
 
         html = await page.get_content()
-        if not html or len(html.strip()) < MIN_HTML_LENGTH:
-            print(f"Failed. Retrying...")
-            raise BadHTML("HTML too small/empty")
-        if 'leaderboard-title' not in html:
-            print(f"Failed. Retrying...")
-            raise BadHTML("Required element missing")
 
-        soup = BeautifulSoup(html, "html.parser")
-        return soup
+    except BROKEN_TAB:
+        # The tab's CDP connection failed: swap in a fresh one, leaving other leased tabs alone.
+        # Anything else (slow page, 404, bad HTML) leaves the tab usable, so it is released as usual.
+        leased, page = page, None
+        await pool.replace(leased)
+        raise
 
     finally:
-        try:
-            if page:
-                pass
-                await page.close()
-        except Exception:
-            pass
+        if page is not None:
+            await pool.release(page)
+
+    if not html or len(html.strip()) < MIN_HTML_LENGTH:
+        raise BadHTML("HTML too small/empty")
+    if 'leaderboard-title' not in html:
+        raise BadHTML("Required element missing")
+
+    return html
 
 
 @retry(
     stop=stop_after_attempt(MAX_ATTEMPTS),
-    wait=wait_exponential(multiplier=RET_MULTIPLIER, min=RET_MIN, max=RET_MAX),
-    retry=retry_if_exception_type(Exception), # retry on any exception.
-    retry_error_callback=return_empty_soup,
+    wait=wait_random_exponential(multiplier=RET_MULTIPLIER, max=RET_MAX),  # full jitter from 0, so even the first retry is spread out
+    retry=retry_if_exception_type(TRANSIENT),
+    before_sleep=log_retry,
+    retry_error_callback=return_empty_html,
 )
-async def get_single_product_soup(browser: nd.Browser, link, selector) -> BeautifulSoup:
+async def get_single_product_html(pool: TabPool, link, selector, wait_range: tuple[float, float] | None = None,
+                                  marker: str | None = None) -> str:
     """
-    This function is used to get the BS4 object of ANY link (despite the name of the function!).
-    :param browser: no driver browser object.
+    This function is used to get the HTML of ANY link (despite the name of the function!).
+    Parsing is left to the caller (see parser.parse_*_html), so it can run off the event loop.
+    :param pool: tab pool; a tab is leased per attempt, so retry backoff does not occupy a tab.
     :param link: the link of ANY page.
     :param selector: need to pass the selector of the product page for wait_for to work.
-    :return: BS4 object.
+    :param wait_range: optional (min, max) seconds of random extra wait after load; None skips it.
+    :param marker: string in the raw HTML showing the page is server-rendered; with static fetch enabled,
+                   a plain HTTP GET containing it is returned without opening a tab. None always uses the browser.
+    :return: page HTML.
+    :raises PageNotFound: the link is a 404 page (raised on the first attempt, without retrying).
     """
-    page = None
+    # One token per attempt, whether the static GET or the browser ends up serving it
+    await _rate_limiter.acquire()
+    html = await try_static_html(link, marker)
+    if html is not None:
+        return html
+
+    page = await pool.acquire()
     try:
-        page = await browser.get(link, new_tab=True)
+        await page.get(link)
 
         # wait until loaded
-        await page.wait_for(selector=selector, timeout=5)
-        await page.wait(random.uniform(0.2, 0.7))
+        await wait_for_page(page, selector, PAGE_WAIT_TIMEOUT)
+        if wait_range is not None:
+            await page.wait(random.uniform(*wait_range))
 
         html = await page.get_content()
-        if not html or len(html.strip()) < MIN_HTML_LENGTH:
-            print(f"Failed. Retrying...")
-            raise BadHTML("HTML too small/empty")
 
-        soup = BeautifulSoup(html, "html.parser")
-        return soup
+    except BROKEN_TAB:
+        # The tab's CDP connection failed: swap in a fresh one, leaving other leased tabs alone.
+        # Anything else (slow page, 404, bad HTML) leaves the tab usable, so it is released as usual.
+        leased, page = page, None
+        await pool.replace(leased)
+        raise
 
     finally:
+        if page is not None:
+            await pool.release(page)
+
+    if not html or len(html.strip()) < MIN_HTML_LENGTH:
+        raise BadHTML("HTML too small/empty")
+
+    return html
+
+
+async def fetch_many(pool: TabPool, links, selector, concurrency: int = MAX_SCRAPER_WORKERS,
+                     wait_range: tuple[float, float] | None = None, process=None, marker: str | None = None) -> list:
+    """
+    Fetch many pages concurrently with get_single_product_html, at most `concurrency` at a time.
+    :param pool: tab pool shared with other fetches.
+    :param links: the links to fetch.
+    :param selector: selector passed to get_single_product_html for every link.
+    :param concurrency: max fetches of this call in flight at once.
+    :param wait_range: passed to get_single_product_html.
+    :param process: optional async callable applied to each page's HTML as soon as that page arrives,
+                    outside the concurrency slot, so processing overlaps the remaining fetches.
+    :param marker: passed to get_single_product_html.
+    :return: list of page HTML (or process results) in the same order as links; a page that raised becomes empty HTML.
+    """
+    sem = asyncio.Semaphore(concurrency)
+
+    async def fetch_one(link):
         try:
-            if page:
-                pass
-                await page.close()
-        except Exception:
-            pass
+            async with sem:
+                html = await get_single_product_html(pool, link, selector, wait_range, marker)
+        except Exception as e:
+            logger.warning("Failed to fetch %s: %r. Using empty HTML.", link, e)
+            html = ""
+        if process is not None:
+            return await process(html)
+        return html
+
+    return await asyncio.gather(*(fetch_one(link) for link in links))
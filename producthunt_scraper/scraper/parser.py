@@ -6,51 +6,123 @@ parse_page — product overview → ProductPage.
 parse_teams — makers section → list of TeamMember.
 parse_team_page — maker about/links → TeamPage.
 parse_products — leaderboard sections → list of Product.
+
+parse_*_html — same, but take the page HTML string and build the soup themselves.
+These are top-level functions on plain str input, so they can run in a process pool.
+Where a required marker string is absent from the HTML they return early without parsing.
+parse_products_html does not build a soup at all: it stream-parses the leaderboard with lxml,
+freeing each finished element as it goes.
 """
-from bs4 import BeautifulSoup
+import logging
+import soupsieve as sv
+from lxml import etree
+from bs4 import BeautifulSoup, SoupStrainer
 from urllib.parse import urljoin
 from producthunt_scraper.core.model import *
 
-
-async def parse_built_with_page(soup: BeautifulSoup) -> List[BuiltWithGroup]:
+logger = logging.getLogger(__name__)
+
+# Built With links are almost always root-relative ("/products/...") or absolute; only other forms go through urljoin
+_BASE = "https://www.producthunt.com"
+
+# Tree builder for every soup: lxml's C parser (a dependency already) is several times faster than html.parser
+SOUP_BACKEND = "lxml"
+
+# Product, makers, maker and built-with pages are only ever queried inside <main>: build just that subtree
+MAIN_ONLY = SoupStrainer("main")
+
+# CSS selectors compiled once at import; soup.select("...") would re-parse the selector string on every call.
+# Product, team and maker page soups only contain the <main> element (MAIN_ONLY), so selectors start there.
+# Built With
+_SEL_BW_GROUPS = sv.compile("details.group")
+_SEL_BW_SUMMARY = sv.compile("summary")
+_SEL_BW_ITEMS = sv.compile("div[data-test^='alternative-item-']")
+_SEL_BW_NAME = sv.compile("span.text-16")
+_SEL_BW_TAGLINE = sv.compile("span.text-secondary")
+_SEL_BW_LINK = sv.compile("a[data-grid-span='1']")
+_SEL_BW_ANY_LINK = sv.compile("a[href]")
+# The two class tokens that set the category row apart, instead of matching its full 80-char class string
+_SEL_BW_CATEGORY_CONTAINER = sv.compile(r"div.max-h-\[1lh\].whitespace-nowrap")
+
+# Product Page
+# Anchored on one distinguishing class token or attribute per level rather than full Tailwind class lists.
+# Description, categories and website all sit in the header block: find it once, then query inside it.
+# gap-3 alone is common, so the header is picked by its structure (the flex column holding the description).
+_SEL_PP_NAME = sv.compile("h1")
+_SEL_PP_HEADER = sv.compile("main > div.flex-col.gap-3:has(> div.relative > div > span)")
+_SEL_PP_DESCRIPTION = sv.compile(":scope > div.relative > div > span")
+_SEL_PP_CATEGORY_CONTAINER = sv.compile(r":scope > div.max-h-\[1lh\]")
+_SEL_PP_CATEGORIES = sv.compile("a[href^='/categories/']")
+_SEL_PP_WEBSITE = sv.compile(r":scope > div.sm\:flex-row > div.sm\:ml-auto > a[href]")
+
+# Team Page
+_SEL_MAKER_CARDS = sv.compile("section[data-test^='maker-card']")
+_SEL_MAKER_NAME = sv.compile("a.text-16.font-semibold.text-gray-900")
+_SEL_MAKER_ROLE = sv.compile("a.text-14.text-gray-700")
+
+# Maker Page
+# About and links are the first two children of the same block: find it once, then query inside it.
+# Picked by its structure (first child holds the about <p>), not as just the first div in <main>.
+_SEL_TP_BODY = sv.compile("main > div:has(> div:first-child > p)")
+_SEL_TP_ABOUT = sv.compile(":scope > div:first-child > p")
+_SEL_TP_LINK_CONTAINER = sv.compile(":scope > div:nth-child(2)")
+_SEL_TP_LINKS = sv.compile("a[data-test='user-link']")
+
+# Leaderboard
+_SEL_POST_ITEMS = sv.compile('section[data-test^="post-item-"]')
+_SEL_POST_NAME = sv.compile('span[data-test^="post-name"] a')
+_SEL_POST_TAGLINE = sv.compile("span.text-secondary")
+_SEL_POST_TOPICS = sv.compile('a[href^="/topics/"]')
+
+
+def parse_built_with_page(soup: BeautifulSoup) -> List[BuiltWithGroup]:
     """Parse Built With details groups into list of BuiltWithGroup (group_name + products)."""
     groups: List[BuiltWithGroup] = []
 
+    # Hot loop: bind the per-item lookups to locals once, instead of resolving them by name on every item
+    select_bw_items = _SEL_BW_ITEMS.select
+    select_name = _SEL_BW_NAME.select_one
+    select_tagline = _SEL_BW_TAGLINE.select_one
+    select_link = _SEL_BW_LINK.select_one
+    select_any_link = _SEL_BW_ANY_LINK.select_one
+    select_cat_container = _SEL_BW_CATEGORY_CONTAINER.select_one
+    _BWP = BuiltWithProduct
+
     # Iterate through the groups (details tags)
-    for details in soup.select("details.group"):
+    for details in _SEL_BW_GROUPS.select(soup):
         try:
-            summary = details.select_one("summary")
+            summary = _SEL_BW_SUMMARY.select_one(details)
             group_name = summary.get_text(" ", strip=True) if summary else ""
 
             products: List[BuiltWithProduct] = []
+            _append = products.append
 
-            for item in details.select("div[data-test^='alternative-item-']"):
+            for item in select_bw_items(details):
                 try:
                     # Name & Tagline
-                    name_tag = item.select_one("span.text-16")
+                    name_tag = select_name(item)
                     name = name_tag.get_text(strip=True) if name_tag else ""
 
-                    tagline_tag = item.select_one("span.text-secondary")
+                    tagline_tag = select_tagline(item)
                     tagline = tagline_tag.get_text(strip=True) if tagline_tag else ""
 
                     # Link
-                    a_tag = item.select_one("a[data-grid-span='1']") or item.select_one("a[href]")
+                    a_tag = select_link(item) or select_any_link(item)
                     href = a_tag.get("href", "") if a_tag else ""
-                    ph_link = urljoin("https://www.producthunt.com/", href)
+                    if href.startswith("/") and not href.startswith("//"):
+                        ph_link = _BASE + href
+                    elif href.startswith(("https://", "http://")):
+                        ph_link = href
+                    else:
+                        ph_link = urljoin(_BASE + "/", href)
 
                     # Categories
-                    categories = []
-                    cat_container_class = "flex max-h-[1lh] flex-wrap items-center gap-2 overflow-hidden text-14 z-10 overflow-hidden whitespace-nowrap"
-
-                    cat_container = item.find("div", class_=cat_container_class)
-
-                    if cat_container:
-                        for cat in cat_container.find_all("a"):
-                            categories.append(cat.get_text(strip=True))
+                    cat_container = select_cat_container(item)
+                    categories = [cat.get_text(strip=True) for cat in cat_container.find_all("a")] if cat_container else []
 
                     # Append to list
-                    products.append(
-                        BuiltWithProduct(
+                    _append(
+                        _BWP(
                             name=name,
                             tagline=tagline,
                             categories=categories,
@@ -69,32 +141,28 @@ async def parse_built_with_page(soup: BeautifulSoup) -> List[BuiltWithGroup]:
             )
 
         except Exception as e:
-            print(f"Error: parse_built_with_page(): {e}")
+            logger.error("Error: parse_built_with_page(): %s", e)
             continue
 
     return groups
 
 
-async def parse_page(soup: BeautifulSoup) -> ProductPage:
+def parse_page(soup: BeautifulSoup) -> ProductPage:
     """Parse product overview soup into ProductPage (name, description, categories, website_link)."""
     try:
-        product_name = soup.select_one("h1").text.strip()
+        product_name = _SEL_PP_NAME.select_one(soup).text.strip()
+
+        header = _SEL_PP_HEADER.select_one(soup)
 
-        description = soup.select_one(
-        "#root-container > div.pt-header > div > main > div.flex.flex-col.gap-3 > div.relative.text-16.font-normal.text-gray-700 > div > span").text.strip()
+        description = _SEL_PP_DESCRIPTION.select_one(header).text.strip()
 
-        container_cat = soup.select_one(
-        r"#root-container > div.pt-header > div > main > div.flex.flex-col.gap-3 > div.flex.max-h-\[1lh\].flex-wrap.items-center.gap-2.overflow-hidden.text-14")
+        container_cat = _SEL_PP_CATEGORY_CONTAINER.select_one(header)
         categories = [
             a.get_text(strip=True)
-            for a in container_cat.select("a[href^='/categories/']")
+            for a in _SEL_PP_CATEGORIES.select(container_cat)
         ]
 
-        website = soup.select_one(
-        r"#root-container > div.pt-header > div > main > "
-        r"div.flex.flex-col.gap-3 > "
-        r"div.flex.flex-col.gap-4.sm\:flex-row.sm\:items-center > "
-        r"div.my-auto.flex.flex-row.items-center.gap-3.sm\:ml-auto > a")["href"]
+        website = _SEL_PP_WEBSITE.select_one(header)["href"]
 
 
         product_page = ProductPage(product_name=product_name,
@@ -106,18 +174,18 @@ async def parse_page(soup: BeautifulSoup) -> ProductPage:
                                    built_with=None)
         return product_page
     except Exception as e:
-        print(f"Error: parse_page(): {e}")
+        logger.error("Error: parse_page(): %s", e)
         return ProductPage(product_name="", product_description="", categories=[], website_link="", team_members=None, built_with=None)
 
 
-async def parse_teams(soup: BeautifulSoup) -> List[TeamMember]:
+def parse_teams(soup: BeautifulSoup) -> List[TeamMember]:
     """Parse makers section into list of TeamMember (name, role, href)."""
     try:
         team = []
 
-        for section in soup.select("section[data-test^='maker-card']"):
-            name_el = section.select_one("a.text-16.font-semibold.text-gray-900")
-            role_el = section.select_one("a.text-14.text-gray-700")
+        for section in _SEL_MAKER_CARDS.select(soup):
+            name_el = _SEL_MAKER_NAME.select_one(section)
+            role_el = _SEL_MAKER_ROLE.select_one(section)
 
             if not name_el or not role_el:
                 continue
@@ -135,21 +203,21 @@ async def parse_teams(soup: BeautifulSoup) -> List[TeamMember]:
         return team
 
     except Exception as e:
-        print(f"Error: parse_teams(): {e}")
+        logger.error("Error: parse_teams(): %s", e)
         return []
 
 
-async def parse_team_page(soup: BeautifulSoup) -> TeamPage:
+def parse_team_page(soup: BeautifulSoup) -> TeamPage:
     """Parse maker about/links into TeamPage (about, links)."""
     try:
-        about = soup.select_one("#root-container > div.pt-header > div > main > div > div:nth-child(1) > p").text.strip()
+        body = _SEL_TP_BODY.select_one(soup)
+
+        about = _SEL_TP_ABOUT.select_one(body).text.strip()
 
         links = []
-        container = soup.select_one(
-            "#root-container > div.pt-header > div > main > div > div:nth-child(2) > div"
-        )
+        container = _SEL_TP_LINK_CONTAINER.select_one(body)
         if container:
-            for a in container.select("a[data-test='user-link']"):
+            for a in _SEL_TP_LINKS.select(container):
                 label = a.get_text(strip=True).lower()
                 href = a.get("href")
 
@@ -167,30 +235,37 @@ async def parse_team_page(soup: BeautifulSoup) -> TeamPage:
         return team_page
 
     except Exception as e:
-        print(f"Error: parse_team_page(): {e}")
+        logger.error("Error: parse_team_page(): %s", e)
         return TeamPage(
             about="",
             links=[])
 
 
-async def parse_products(soup: BeautifulSoup) -> List[Product]:
+def parse_products(soup: BeautifulSoup) -> List[Product]:
     """Parse leaderboard post-item sections into list of Product (name, tagline, topics, ph_url; product_page None)."""
     try:
         products = []
 
-        sections = soup.select('section[data-test^="post-item-"]')
+        # Hot loop: bind the per-section lookups to locals once
+        _append = products.append
+        select_name = _SEL_POST_NAME.select_one
+        select_tagline = _SEL_POST_TAGLINE.select_one
+        select_topics = _SEL_POST_TOPICS.select
+        _Product = Product
+
+        sections = _SEL_POST_ITEMS.select(soup)
 
         for section in sections:
-            name_el = section.select_one('span[data-test^="post-name"] a')
-            tagline_el = section.select_one("span.text-secondary")
-            topic_els = section.select('a[href^="/topics/"]')
+            name_el = select_name(section)
+            tagline_el = select_tagline(section)
+            topic_els = select_topics(section)
             ph_url = name_el.get('href')
 
             if not name_el or not tagline_el:
                 continue
 
-            products.append(
-                Product(
+            _append(
+                _Product(
                     name=name_el.get_text(strip=True),
                     tagline=tagline_el.get_text(strip=True),
                     topics=[t.get_text(strip=True) for t in topic_els],
@@ -203,5 +278,132 @@ async def parse_products(soup: BeautifulSoup) -> List[Product]:
 
         return products
     except Exception as e:
-        print(f"Error: parse_products(): {e}. Returning empty List[Product].")
+        logger.error("Error: parse_products(): %s. Returning empty List[Product].", e)
+        return []
+
+
+def make_soup(html: str, main_only: bool = False) -> BeautifulSoup:
+    """Build a BeautifulSoup with SOUP_BACKEND (lxml); with main_only, only the <main> subtree is built."""
+    if main_only:
+        return BeautifulSoup(html, SOUP_BACKEND, parse_only=MAIN_ONLY)
+    return BeautifulSoup(html, SOUP_BACKEND)
+
+
+def parse_built_with_html(html: str) -> List[BuiltWithGroup]:
+    """parse_built_with_page on raw built-with page HTML."""
+    # Groups are <details class="group"> elements: without any <details>, skip building the soup
+    if "<details" not in html:
+        return []
+    return parse_built_with_page(make_soup(html, main_only=True))
+
+
+def parse_page_html(html: str) -> ProductPage:
+    """parse_page on raw product overview HTML."""
+    return parse_page(make_soup(html, main_only=True))
+
+
+def parse_teams_html(html: str) -> List[TeamMember]:
+    """parse_teams on raw makers page HTML."""
+    if "maker-card" not in html:
+        return []
+    return parse_teams(make_soup(html, main_only=True))
+
+
+def parse_team_page_html(html: str) -> TeamPage:
+    """parse_team_page on raw maker profile HTML."""
+    return parse_team_page(make_soup(html, main_only=True))
+
+
+# Characters of leaderboard HTML fed to the streaming parser at a time
+STREAM_CHUNK = 64 * 1024
+
+
+def _text(el) -> str:
+    """Text of an lxml element like bs4's get_text(strip=True): stripped pieces joined with no separator."""
+    return "".join(t.strip() for t in el.itertext())
+
+
+def _parse_post_item(section) -> Optional[Product]:
+    """Extract one Product from a leaderboard post-item <section> element (lxml); None if name/tagline missing."""
+    name_el = None
+    for span in section.iter("span"):
+        if span.get("data-test", "").startswith("post-name"):
+            name_el = next(span.iter("a"), None)
+            if name_el is not None:
+                break
+
+    tagline_el = None
+    for span in section.iter("span"):
+        if "text-secondary" in span.get("class", "").split():
+            tagline_el = span
+            break
+
+    if name_el is None or tagline_el is None:
+        return None
+
+    topics = [_text(a) for a in section.iter("a") if a.get("href", "").startswith("/topics/")]
+
+    return Product(
+        name=_text(name_el),
+        tagline=_text(tagline_el),
+        topics=topics,
+        ph_url=name_el.get("href"),
+
+        date=None,
+        product_page=None,
+    )
+
+
+def parse_products_html(html: str) -> List[Product]:
+    """
+    Parse raw leaderboard HTML into list of Product, like parse_products, in one streaming pass.
+    The str is fed to lxml in STREAM_CHUNK-sized slices (no encoded copy of the whole page). Each
+    post-item section is extracted as soon as it is closed; every finished element outside a
+    section, including <head> and inline scripts, is cleared and dropped, so only the open path
+    and the current section are held in the tree.
+    """
+    if "post-item-" not in html:
+        return []
+    try:
+        products = []
+        _append = products.append
+        parse_item = _parse_post_item
+
+        parser = etree.HTMLPullParser(events=("start", "end"))
+        read_events = parser.read_events
+        capture = None  # the post-item section being read, if any
+
+        def drain():
+            nonlocal capture
+            for event, el in read_events():
+                if event == "start":
+                    if capture is None and el.tag == "section" and el.get("data-test", "").startswith("post-item-"):
+                        capture = el
+                    continue
+
+                if el is capture:
+                    product = parse_item(el)
+                    if product is not None:
+                        _append(product)
+                    capture = None
+                elif capture is not None:
+                    # Part of the section being read: kept until the section closes
+                    continue
+
+                # Free the finished element and its finished earlier siblings
+                el.clear()
+                parent = el.getparent()
+                if parent is not None:
+                    while el.getprevious() is not None:
+                        del parent[0]
+
+        for start in range(0, len(html), STREAM_CHUNK):
+            parser.feed(html[start:start + STREAM_CHUNK])
+            drain()
+        parser.close()
+        drain()
+
+        return products
+    except Exception as e:
+        logger.error("Error: parse_products_html(): %s. Returning empty List[Product].", e)
         return []
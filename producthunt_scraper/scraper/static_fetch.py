@@ -0,0 +1,67 @@
+"""
+Plain HTTP fetch path for server-rendered pages.
+
+Many Product Hunt pages are rendered on the server, so their HTML is complete without
+running any JavaScript. For those, one GET over a shared, pooled httpx connection is much
+cheaper than loading the page in a browser tab. fetch_static_html returns the HTML only if
+it contains the caller's marker string; otherwise (challenge page, client-rendered page,
+network error) it returns None and the caller falls back to the browser.
+"""
+import importlib.util
+import logging
+import httpx
+
+# Seconds for the whole static request; a slow response just falls back to the browser
+STATIC_TIMEOUT = 10
+STATIC_MAX_CONNECTIONS = 50
+
+# HTTP/2 multiplexes all requests over one connection, but needs the optional h2 package
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+logger = logging.getLogger(__name__)
+
+_client: httpx.AsyncClient | None = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            http2=HTTP2,
+            limits=httpx.Limits(max_connections=STATIC_MAX_CONNECTIONS),
+            timeout=STATIC_TIMEOUT,
+            follow_redirects=True,
+        )
+    return _client
+
+
+async def fetch_static_html(link: str, marker: str) -> str | None:
+    """
+    GET link without a browser.
+    :param link: the page to fetch.
+    :param marker: string the page HTML must contain to count as fully rendered.
+    :return: page HTML, or None if the request failed, was not 200, or the marker is missing.
+    """
+    try:
+        response = await _get_client().get(link)
+    except httpx.HTTPError as e:
+        logger.debug("Static fetch failed for %s: %r", link, e)
+        return None
+
+    if response.status_code != 200:
+        logger.debug("Static fetch of %s returned %d", link, response.status_code)
+        return None
+    html = response.text
+    if marker not in html:
+        logger.debug("Static fetch of %s is missing %r", link, marker)
+        return None
+    return html
+
+
+async def close_static_client() -> None:
+    """Close the shared client if it was created. Call once at the end of a run."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
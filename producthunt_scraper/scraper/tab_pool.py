@@ -0,0 +1,94 @@
+"""
+Pool of reusable browser tabs.
+
+Opening and closing a tab per page (CDP Target.createTarget / closeTarget) is the
+largest fixed per-page cost in nodriver. TabPool opens a fixed number of tabs once
+and leases them out; a leased tab is navigated to the next URL and, when done,
+parked on about:blank and returned to the pool instead of being closed. One pool is
+shared by the whole scrape run, and its size also caps how many pages load at once.
+"""
+import asyncio
+import logging
+import os
+import nodriver as nd
+from nodriver import cdp
+
+# Max browser tabs open at once across all concurrent page fetches.
+MAX_TABS = int(os.environ.get("PH_MAX_TABS", "8"))
+
+logger = logging.getLogger(__name__)
+
+
+class TabPool:
+    """Fixed-size pool of browser tabs leased via an asyncio.Queue. Create with `await TabPool.create(...)`."""
+
+    def __init__(self, browser: nd.Browser, size: int):
+        """Initialize an empty pool for browser; use create() to open the tabs."""
+        self.browser = browser
+        self.size = size
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._tabs: list = []
+
+    @classmethod
+    async def create(cls, browser: nd.Browser, size: int = MAX_TABS) -> "TabPool":
+        """Open size blank tabs in browser and return a pool holding them."""
+        pool = cls(browser, size)
+        for _ in range(size):
+            tab = await browser.get("about:blank", new_tab=True)
+            pool._tabs.append(tab)
+            pool._queue.put_nowait(tab)
+        return pool
+
+    async def acquire(self) -> nd.Tab:
+        """Lease a tab, waiting until one is free."""
+        return await self._queue.get()
+
+    async def release(self, tab: nd.Tab) -> None:
+        """
+        Navigate a leased tab back to about:blank and return it to the pool.
+        Parking idle tabs on a blank page stops the previous page's scripts from running in the background.
+        If the tab cannot be reset it is replaced with a fresh one.
+        Sends a bare Page.navigate: tab.get() would also sleep 0.5s waiting for the blank page,
+        holding up the caller's result on every fetch.
+        """
+        try:
+            await tab.send(cdp.page.navigate("about:blank"))
+        except Exception:
+            await self.replace(tab)
+            return
+        self._queue.put_nowait(tab)
+
+    async def replace(self, tab: nd.Tab) -> None:
+        """
+        Close a leased tab that failed and put a fresh blank tab in the pool in its place.
+        Only this tab is affected; tabs leased by other fetches keep running.
+        Never raises: if no fresh tab can be opened, the old tab goes back into the pool instead,
+        so the pool never shrinks and callers can re-raise their own error.
+        """
+        try:
+            new_tab = await self.browser.get("about:blank", new_tab=True)
+        except BaseException as e:
+            # Keep the slot: a broken tab fails its next fetch (and is replaced again), a lost slot hangs acquire()
+            self._queue.put_nowait(tab)
+            if not isinstance(e, Exception):
+                raise
+            logger.warning("Could not open a replacement tab (%r); keeping the old one", e)
+            return
+
+        if tab in self._tabs:
+            self._tabs.remove(tab)
+        self._tabs.append(new_tab)
+        self._queue.put_nowait(new_tab)
+        try:
+            await tab.close()
+        except Exception:
+            pass
+
+    async def close(self) -> None:
+        """Close every tab owned by the pool."""
+        for tab in self._tabs:
+            try:
+                await tab.close()
+            except Exception:
+                pass
+        self._tabs.clear()